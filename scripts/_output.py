@@ -0,0 +1,14 @@
+"""Shared output helpers for the analysis scripts."""
+
+import json
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; json.dumps is the fallback.
+    orjson = None
+
+
+def dumps_json(obj: dict) -> str:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj, indent=2)
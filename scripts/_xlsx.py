@@ -0,0 +1,110 @@
+"""Shared streaming XLSX parsing helpers for the analysis scripts."""
+
+import re
+import zipfile
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import xml.etree.ElementTree as ET
+
+MAIN_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+SHEETDATA_TAG = f"{{{MAIN_NS}}}sheetData"
+ROW_TAG = f"{{{MAIN_NS}}}row"
+C_TAG = f"{{{MAIN_NS}}}c"
+V_TAG = f"{{{MAIN_NS}}}v"
+SI_TAG = f"{{{MAIN_NS}}}si"
+T_TAG = f"{{{MAIN_NS}}}t"
+
+_COLUMN_INDEX_CACHE: dict[str, int] = {}
+
+# XLSX cell references are always uppercase letters followed by digits; the
+# byte loop below relies on that, so assert it in debug runs only. The assert
+# sits on the cache-miss path, so it fires once per distinct column, not per
+# cell.
+_CELL_REF_RE = re.compile(r"[A-Z]+\d+$")
+
+
+def column_index(cell_ref: str) -> int:
+    # Key the cache on the column letters only: full references ("A1", "A2")
+    # never repeat within a sheet, but the letter prefixes do on every row,
+    # so the cache stays at one entry per distinct column.
+    letters = cell_ref.rstrip("0123456789")
+    cached = _COLUMN_INDEX_CACHE.get(letters)
+    if cached is not None:
+        return cached
+    assert _CELL_REF_RE.match(cell_ref), f"unexpected cell reference: {cell_ref!r}"
+    index = 0
+    for byte in letters.encode("ascii"):
+        index = index * 26 + (byte - 0x40)
+    index -= 1
+    _COLUMN_INDEX_CACHE[letters] = index
+    return index
+
+
+def read_shared_strings(archive: zipfile.ZipFile) -> list[str]:
+    shared_strings = []
+    shared_path = "xl/sharedStrings.xml"
+    if shared_path in archive.namelist():
+        with archive.open(shared_path) as handle:
+            # Track the <sst> root so decoded <si> elements can be detached
+            # from it; clear() alone leaves them referenced as children and
+            # memory would still grow with the string count.
+            root = None
+            for event, elem in ET.iterparse(handle, events=("start", "end")):
+                if event == "start":
+                    if root is None:
+                        root = elem
+                    continue
+                if elem.tag == SI_TAG:
+                    # Rich-text entries split their text across several <t>
+                    # runs; plain entries have exactly one.
+                    shared_strings.append("".join(t.text or "" for t in elem.iter(T_TAG)))
+                    elem.clear()
+                    del root[:]
+    return shared_strings
+
+
+def iter_rows(path: Path, sheet_path: str = "xl/worksheets/sheet1.xml") -> Iterator[list[str | None]]:
+    with zipfile.ZipFile(path) as archive:
+        if sheet_path not in archive.namelist():
+            raise FileNotFoundError(f"Sheet XML not found: {sheet_path}")
+
+        # Decode shared strings on a worker thread: zip inflation runs in C
+        # without the GIL, so it overlaps with parsing the sheet stream.
+        # The result is only awaited at the first shared-string cell.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            shared_future = executor.submit(read_shared_strings, archive)
+            shared_strings: list[str] | None = None
+            with archive.open(sheet_path) as handle:
+                # Track <sheetData> so processed rows can be detached from
+                # it; clear() alone leaves them referenced as children and
+                # memory would still grow with the row count.
+                sheet_data = None
+                for event, row in ET.iterparse(handle, events=("start", "end")):
+                    if event == "start":
+                        if sheet_data is None and row.tag == SHEETDATA_TAG:
+                            sheet_data = row
+                        continue
+                    if row.tag != ROW_TAG:
+                        continue
+                    row_values: list[str | None] = []
+                    for cell in row:
+                        if cell.tag != C_TAG:
+                            continue
+                        cell_ref = cell.get("r")
+                        value_elem = cell.find(V_TAG)
+                        if not cell_ref or value_elem is None:
+                            continue
+                        value = value_elem.text
+                        if cell.get("t") == "s" and value is not None:
+                            if shared_strings is None:
+                                shared_strings = shared_future.result()
+                            value = shared_strings[int(value)]
+                        idx = column_index(cell_ref)
+                        if idx >= len(row_values):
+                            row_values.extend([None] * (idx + 1 - len(row_values)))
+                        row_values[idx] = value
+                    yield row_values
+                    row.clear()
+                    if sheet_data is not None:
+                        del sheet_data[:]
@@ -1,74 +1,102 @@
-import json
+import array
+import csv
+import itertools
 import math
-import zipfile
+import re
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-import xml.etree.ElementTree as ET
+
+from _output import dumps_json
+from _xlsx import iter_rows
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python paths below still work.
+    np = None
 
 
 DATA_FILE = Path("je_samples.xlsx")
 OUTPUT_DIR = Path("outputs")
 
+# Rows inspected up front to decide which kernels (numeric coercion, date
+# parsing) each column needs at all.
+PROBE_ROW_COUNT = 50
 
-def column_index(cell_ref: str) -> int:
-    letters = "".join(ch for ch in cell_ref if ch.isalpha())
-    index = 0
-    for char in letters:
-        index = index * 26 + (ord(char.upper()) - ord("A") + 1)
-    return index - 1
-
-
-def parse_sheet(path: Path) -> list[list[str | None]]:
-    with zipfile.ZipFile(path) as archive:
-        shared_strings = []
-        shared_path = "xl/sharedStrings.xml"
-        if shared_path in archive.namelist():
-            shared_root = ET.fromstring(archive.read(shared_path))
-            ns = {"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
-            for item in shared_root.findall("main:si", ns):
-                text_elem = item.find(".//main:t", ns)
-                shared_strings.append(text_elem.text if text_elem is not None else "")
-
-        sheet_root = ET.fromstring(archive.read("xl/worksheets/sheet1.xml"))
-        ns = {"main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main"}
-        rows = []
-        for row in sheet_root.findall("main:sheetData/main:row", ns):
-            cells = {}
-            for cell in row.findall("main:c", ns):
-                cell_ref = cell.get("r")
-                value_elem = cell.find("main:v", ns)
-                if not cell_ref or value_elem is None:
-                    continue
-                value = value_elem.text
-                if cell.get("t") == "s" and value is not None:
-                    value = shared_strings[int(value)]
-                cells[column_index(cell_ref)] = value
-            max_index = max(cells.keys(), default=-1)
-            row_values = [None] * (max_index + 1)
-            for idx, value in cells.items():
-                row_values[idx] = value
-            rows.append(row_values)
-    return rows
-
-
-def parse_date(value: str) -> datetime | None:
-    formats = [
-        "%Y-%m-%d",
-        "%Y-%m",
-        "%m/%d/%Y",
-        "%m/%d/%y",
-        "%Y/%m/%d",
-        "%Y-%m-%d %H:%M:%S",
-    ]
-    for fmt in formats:
+
+DATE_FORMATS = [
+    "%Y-%m-%d",
+    "%Y-%m",
+    "%m/%d/%Y",
+    "%m/%d/%y",
+    "%Y/%m/%d",
+    "%Y-%m-%d %H:%M:%S",
+]
+
+# Every supported format starts with digits followed by "-" or "/"; anything
+# else cannot parse, so skip the strptime attempts (failed parses dominate
+# date-detection cost on non-date columns).
+_DATE_CANDIDATE_RE = re.compile(r"\d{1,4}[-/]\d{1,2}")
+
+
+@lru_cache(maxsize=None)
+def parse_date(value: str, first_format: str | None = None) -> tuple[datetime | None, str | None]:
+    """Parse value, trying first_format (the column's last hit) before the rest.
+
+    Posting dates repeat heavily in journal extracts, so each distinct string
+    is parsed at most once per format hint.
+    """
+    if _DATE_CANDIDATE_RE.match(value) is None:
+        return None, None
+    if first_format is not None:
         try:
-            return datetime.strptime(value, fmt)
+            return datetime.strptime(value, first_format), first_format
         except ValueError:
+            pass
+    for fmt in DATE_FORMATS:
+        if fmt == first_format:
             continue
-    return None
+        try:
+            return datetime.strptime(value, fmt), fmt
+        except ValueError:
+            continue
+    return None, None
+
 
+def build_row_handler(column_count: int, detect_numeric: list[bool], detect_date: list[bool]):
+    """Generate a row handler specialized to the probed column classification.
 
-def numeric_stats(values: list[float]) -> dict:
+    Emitting straight-line code per column (and only the kernels that column
+    needs) removes the per-cell mask checks and index arithmetic of the
+    generic loop.
+    """
+    lines = ["def handle_row(row, missing_counts, non_null_counts, numeric_buffers, date_buffers, last_formats):"]
+    for idx in range(column_count):
+        lines.append(f'    value = row[{idx}]')
+        lines.append('    if value in (None, ""):')
+        lines.append(f"        missing_counts[{idx}] += 1")
+        lines.append("    else:")
+        lines.append(f"        non_null_counts[{idx}] += 1")
+        if detect_date[idx] or detect_numeric[idx]:
+            lines.append("        text = str(value)")
+        if detect_date[idx]:
+            lines.append(f"        parsed, matched_format = parse_date(text, last_formats[{idx}])")
+            lines.append("        if parsed is not None:")
+            lines.append(f"            date_buffers[{idx}].append(parsed)")
+            lines.append(f"            last_formats[{idx}] = matched_format")
+        if detect_numeric[idx]:
+            lines.append("        try:")
+            lines.append(f"            numeric_buffers[{idx}].append(float(text))")
+            lines.append("        except ValueError:")
+            lines.append("            pass")
+    if len(lines) == 1:  # zero columns: the def still needs a body to compile
+        lines.append("    pass")
+    namespace = {"parse_date": parse_date}
+    exec(compile("\n".join(lines), "<row_handler>", "exec"), namespace)
+    return namespace["handle_row"]
+
+
+def numeric_stats(values: "array.array[float]") -> dict:
     count = len(values)
     if count == 0:
         return {
@@ -78,78 +106,118 @@ def numeric_stats(values: list[float]) -> dict:
             "min": None,
             "max": None,
         }
-    mean = sum(values) / count
-    variance = sum((value - mean) ** 2 for value in values) / (count - 1) if count > 1 else 0.0
-    std = math.sqrt(variance)
+    if np is not None:
+        # array("d") shares its buffer with float64, so this is a zero-copy view.
+        arr = np.frombuffer(values, dtype=np.float64)
+        return {
+            "count": count,
+            "mean": float(arr.mean()),
+            "std": float(arr.std(ddof=1)) if count > 1 else 0.0,
+            "min": float(arr.min()),
+            "max": float(arr.max()),
+        }
+    # Single-pass Welford update: numerically stable for amounts spanning
+    # many orders of magnitude, and one scan instead of two.
+    mean = 0.0
+    m2 = 0.0
+    minimum = math.inf
+    maximum = -math.inf
+    for i, value in enumerate(values, 1):
+        delta = value - mean
+        mean += delta / i
+        m2 += delta * (value - mean)
+        if value < minimum:
+            minimum = value
+        if value > maximum:
+            maximum = value
+    std = math.sqrt(m2 / (count - 1)) if count > 1 else 0.0
     return {
         "count": count,
         "mean": mean,
         "std": std,
-        "min": min(values),
-        "max": max(values),
+        "min": minimum,
+        "max": maximum,
     }
 
 
 def main() -> None:
     OUTPUT_DIR.mkdir(parents=True, exist_ok=True)
-    rows = parse_sheet(DATA_FILE)
-    if not rows:
+    row_iter = iter_rows(DATA_FILE)
+    headers = next(row_iter, None)
+    if headers is None:
         raise RuntimeError("No rows found in worksheet.")
-
-    headers = rows[0]
-    data_rows = rows[1:]
     column_count = len(headers)
 
-    normalized_rows = []
-    for row in data_rows:
-        normalized = row + [None] * (column_count - len(row))
-        normalized_rows.append(normalized[:column_count])
-
     columns = [str(header) if header is not None else f"Column{idx+1}" for idx, header in enumerate(headers)]
-    column_values = {name: [] for name in columns}
-
-    for row in normalized_rows:
-        for idx, name in enumerate(columns):
-            value = row[idx] if idx < len(row) else None
-            column_values[name].append(value)
-
-    missing_values = {name: sum(1 for value in values if value in (None, "")) for name, values in column_values.items()}
 
-    date_columns = {}
-    for name, values in column_values.items():
-        parsed_dates = []
-        for value in values:
-            if value in (None, ""):
-                continue
-            parsed = parse_date(str(value))
-            if parsed is not None:
-                parsed_dates.append(parsed)
-        if parsed_dates:
-            ratio = len(parsed_dates) / max(1, len([v for v in values if v not in (None, "")]))
-            if ratio >= 0.8:
-                date_columns[name] = {
-                    "min": min(parsed_dates).isoformat(),
-                    "max": max(parsed_dates).isoformat(),
-                    "non_null_ratio": round(ratio, 4),
-                }
+    # One fused scan over the rows feeds all three aggregations (missing
+    # counts, date detection, numeric stats) instead of materializing every
+    # column as a list and walking the table three times.
+    missing_counts = [0] * column_count
+    non_null_counts = [0] * column_count
+    # array("d") keeps each numeric column as a contiguous double[] instead of
+    # a list of boxed floats (~4x smaller, and zero-copy into NumPy).
+    numeric_buffers = [array.array("d") for _ in columns]
+    date_buffers: list[list[datetime]] = [[] for _ in columns]
+    last_formats: list[str | None] = [None] * column_count
+    row_count = 0
 
-    numeric_summary = {}
-    for name, values in column_values.items():
-        numeric_values = []
-        for value in values:
+    # Probe the first rows to classify each column: a column whose sampled
+    # values never coerce to float (or never parse as a date) skips that
+    # kernel for the rest of the scan. Columns with no sampled non-null
+    # values stay fully active.
+    probe_rows = list(itertools.islice(row_iter, PROBE_ROW_COUNT))
+    probe_non_null = [0] * column_count
+    probe_numeric = [0] * column_count
+    probe_date = [0] * column_count
+    for row in probe_rows:
+        for idx in range(min(column_count, len(row))):
+            value = row[idx]
             if value in (None, ""):
                 continue
+            probe_non_null[idx] += 1
+            text = str(value)
             try:
-                numeric_values.append(float(str(value)))
+                float(text)
+                probe_numeric[idx] += 1
             except ValueError:
-                continue
-        stats = numeric_stats(numeric_values)
+                pass
+            if parse_date(text)[0] is not None:
+                probe_date[idx] += 1
+    detect_numeric = [probe_non_null[idx] == 0 or probe_numeric[idx] > 0 for idx in range(column_count)]
+    detect_date = [probe_non_null[idx] == 0 or probe_date[idx] > 0 for idx in range(column_count)]
+
+    handle_row = build_row_handler(column_count, detect_numeric, detect_date)
+    for row in itertools.chain(probe_rows, row_iter):
+        row_count += 1
+        if len(row) < column_count:
+            row.extend([None] * (column_count - len(row)))
+        handle_row(row, missing_counts, non_null_counts, numeric_buffers, date_buffers, last_formats)
+
+    missing_values = {name: missing_counts[idx] for idx, name in enumerate(columns)}
+
+    date_columns = {}
+    for idx, name in enumerate(columns):
+        parsed_dates = date_buffers[idx]
+        if not parsed_dates:
+            continue
+        ratio = len(parsed_dates) / max(1, non_null_counts[idx])
+        if ratio >= 0.8:
+            date_columns[name] = {
+                "min": min(parsed_dates).isoformat(),
+                "max": max(parsed_dates).isoformat(),
+                "non_null_ratio": round(ratio, 4),
+            }
+
+    numeric_summary = {}
+    for idx, name in enumerate(columns):
+        stats = numeric_stats(numeric_buffers[idx])
         if stats["count"] > 0:
             numeric_summary[name] = stats
 
     summary = {
         "file": str(DATA_FILE),
-        "row_count": len(data_rows),
+        "row_count": row_count,
         "column_count": column_count,
         "columns": columns,
         "missing_values": missing_values,
@@ -157,14 +225,15 @@ def main() -> None:
         "numeric_summary": numeric_summary,
     }
 
-    (OUTPUT_DIR / "summary.json").write_text(json.dumps(summary, indent=2))
+    (OUTPUT_DIR / "summary.json").write_text(dumps_json(summary))
 
-    numeric_csv_lines = ["column,count,mean,std,min,max"]
-    for name, stats in numeric_summary.items():
-        numeric_csv_lines.append(
-            f"{name},{stats['count']},{stats['mean']},{stats['std']},{stats['min']},{stats['max']}"
-        )
-    (OUTPUT_DIR / "numeric_summary.csv").write_text("\n".join(numeric_csv_lines))
+    numeric_csv_rows = [["column", "count", "mean", "std", "min", "max"]]
+    numeric_csv_rows.extend(
+        [name, stats["count"], stats["mean"], stats["std"], stats["min"], stats["max"]]
+        for name, stats in numeric_summary.items()
+    )
+    with (OUTPUT_DIR / "numeric_summary.csv").open("w", newline="") as handle:
+        csv.writer(handle).writerows(numeric_csv_rows)
 
     summary_md_lines = [
         "# Journal Entry Sample Summary",